@@ -180,15 +180,18 @@ class Summary(ProjectsCommand):
         else:
             blanks = []
             worked = []
+            # Compute the last update time once per project, with the same
+            # current time for all open entries
+            now = datetime.datetime.now()
             for p in projs:
-                if p.last_updated is None:
+                if (last_updated := p.get_last_updated(now)) is None:
                     blanks.append(p)
                 else:
-                    worked.append(p)
+                    worked.append((last_updated, p))
 
             blanks.sort(key=lambda p: p.name)
-            worked.sort(key=lambda p: p.last_updated)
-            sorted_projects = blanks + worked
+            worked.sort(key=lambda x: x[0])
+            sorted_projects = blanks + [p for last_updated, p in worked]
 
         def add_summary(p: egtlib.Project) -> None:
             table.add_row([c.func(p) for c in active_cols])
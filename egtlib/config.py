@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
+import re
 from configparser import ConfigParser
 from functools import cached_property
 
@@ -82,6 +83,21 @@ class Config:
         """
         return self.config.get("config", "time-format")
 
+    @cached_property
+    def log_date_format(self) -> str:
+        """
+        Return the format for the header of new full-day log entries
+        """
+        return self.date_format + ":"
+
+    @cached_property
+    def log_datetime_format(self) -> str:
+        """
+        Return the format for the header of new log entries with a start time,
+        without the end time
+        """
+        return self.log_date_format + " " + self.time_format + "-"
+
     @cached_property
     def sync_tw_annotations(self) -> bool:
         """
@@ -90,11 +106,11 @@ class Config:
         return self.config.getboolean("config", "sync-tw-annotations")
 
     @cached_property
-    def autotag_rules(self) -> list[tuple[str, str]]:
+    def autotag_rules(self) -> list[tuple[str, re.Pattern]]:
         """
-        Return a list of (tag, regexp) autotagging rules
+        Return a list of (tag, compiled regexp) autotagging rules
         """
         if "autotag" not in self.config:
             return []
         autotags = self.config["autotag"]
-        return [(tag, regexp) for tag, regexp in autotags.items()]
+        return [(tag, re.compile(regexp)) for tag, regexp in autotags.items()]
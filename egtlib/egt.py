@@ -1,6 +1,5 @@
 import datetime
 import logging
-import re
 import sys
 import warnings
 from functools import cached_property
@@ -40,6 +39,7 @@ class WeeklyReport:
         log = []
         count = 0
         mins = 0
+        now = datetime.datetime.now()
         for p in self.projs:
             for e in p.log.entries:
                 if intervals_intersect(
@@ -47,7 +47,7 @@ class WeeklyReport:
                 ):
                     log.append((e, p))
                     count += 1
-                    mins += e.duration
+                    mins += e.get_duration(now)
 
         res.update(
             count=count,
@@ -198,7 +198,7 @@ class Egt:
         tags: set[str] = set()
         str_path = abspath.as_posix()
         for tag, regexp in self.config.autotag_rules:
-            if re.search(regexp, str_path):
+            if regexp.search(str_path):
                 tags.add(tag)
         return tags
 
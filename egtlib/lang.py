@@ -4,9 +4,10 @@ import contextlib
 import locale
 import logging
 from collections.abc import Iterator
-from typing import Generator
+from typing import TYPE_CHECKING, Generator
 
-import dateutil.parser
+if TYPE_CHECKING:
+    import dateutil.parser
 
 log = logging.getLogger(__name__)
 
@@ -34,6 +35,9 @@ class Locale:
         self.cached_parserinfo: dict[str, type[dateutil.parser.parserinfo]] = {}
 
     def get_parserinfo(self, lang: str | None) -> dateutil.parser.parserinfo:
+        # dateutil is slow to import: only load it when needed
+        import dateutil.parser
+
         if lang is None:
             return dateutil.parser.parserinfo()
 
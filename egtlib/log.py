@@ -3,81 +3,261 @@ from __future__ import annotations
 import datetime
 import re
 import sys
-from collections import Counter
+from collections import defaultdict
 from collections.abc import Generator
-from typing import IO, Any, Self
-
-import dateutil.parser
+from functools import cached_property, lru_cache
+from typing import IO, TYPE_CHECKING, Any, Self, cast
 
 from . import project, utils
 from .lang import get_parserinfo
 from .parse import Lines
 from .utils import format_duration
 
+if TYPE_CHECKING:
+    import dateutil.parser
+
+# Immutable values used when building entry times, created only once
+MIDNIGHT = datetime.time(0)
+ONE_DAY = datetime.timedelta(days=1)
+
 
 class LogParser:
     ENTRY_TYPES: list[type[EntryBase]] = []
 
-    def __init__(self, lines: Lines, lang: str | None = None):
+    # Regular expression matching the start lines of all ENTRY_TYPES, built
+    # on first use by get_dispatch_re()
+    _dispatch_re: re.Pattern | None = None
+    # Entry types and start line regexps that _dispatch_re was built from
+    _dispatch_key: tuple[tuple[type[EntryBase], tuple[re.Pattern, ...]], ...] = ()
+    # Map each alternative of _dispatch_re to its entry type, and the names
+    # and indices of its groups
+    _dispatch_info: dict[str, tuple[type[EntryBase], list[tuple[str, int]]]] = {}
+    # Flags of start line regexps that can be carried over to _dispatch_re
+    DISPATCH_FLAGS = re.VERBOSE | re.ASCII | re.UNICODE
+
+    # Most common date formats, parsed without using dateutil
+    re_date_year = re.compile(r"^\d{4}$", re.ASCII)
+    re_date_iso = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$", re.ASCII)
+    re_date_day_month = re.compile(r"^([0-9]{1,2})\s+(\w+)(?:\s+([0-9]{4}))?$")
+
+    # strptime formats tried before falling back to dateutil
+    FAST_FORMATS: tuple[str, ...] = ("%Y-%m-%d %H:%M",)
+    # strptime directives that depend on the process locale
+    re_locale_directive = re.compile(r"%[aAbBpcxX]")
+
+    # Cache of parse_date results, shared by all parsers, indexed by string,
+    # default datetime, language and strptime formats
+    _date_cache: dict[tuple[str, datetime.datetime, str | None, tuple[str, ...]], datetime.datetime | None] = {}
+    # Size after which the parse_date cache is cleared
+    DATE_CACHE_SIZE = 4096
+
+    def __init__(self, lines: Lines, lang: str | None = None, date_format: str | None = None):
         self.lines = lines
         self.lang = lang
-        self.parserinfo = get_parserinfo(lang)
-        # Defaults for missing parsedate values
+        # Defaults for missing parsedate values. The current date is looked
+        # up only once per parser
         self.default = datetime.datetime(utils.today().year, 1, 1)
         # Log of parse errors
         self.errors: list[str] = []
+        # strptime formats to try before using dateutil. The configured date
+        # format is only used with the default language, and only if it is
+        # numeric, since strptime looks up names in the process locale
+        # instead of the dateutil parserinfo
+        self._fast_formats: tuple[str, ...] = self.FAST_FORMATS
+        if (
+            lang is None
+            and date_format is not None
+            and date_format not in self._fast_formats
+            and not self.re_locale_directive.search(date_format)
+        ):
+            self._fast_formats = (date_format,) + self._fast_formats
+
+    @cached_property
+    def parserinfo(self) -> dateutil.parser.parserinfo:
+        """
+        Month and weekday names for the log language, loaded on first use
+        """
+        return get_parserinfo(self.lang)
+
+    @cached_property
+    def _dateutil_parser(self) -> dateutil.parser.parser:
+        """
+        dateutil parser, created on first use and reused across parse_date
+        calls
+        """
+        import dateutil.parser
+
+        return dateutil.parser.parser(self.parserinfo)
+
+    def _parse_date_fast(self, s: str) -> datetime.datetime | None:
+        """
+        Try parsing a date in one of the most common formats, without using
+        dateutil.
+
+        Return None if the date is in none of them.
+        """
+        try:
+            if self.re_date_year.match(s):
+                return datetime.datetime(int(s), 1, 1)
+            if mo := self.re_date_iso.match(s):
+                return datetime.datetime(int(mo.group(1)), int(mo.group(2)), int(mo.group(3)))
+            if mo := self.re_date_day_month.match(s):
+                # Month names are looked up in the language of the project
+                if (month := self.parserinfo.month(mo.group(2))) is not None:
+                    year = int(mo.group(3)) if mo.group(3) else self.default.year
+                    return datetime.datetime(year, month, int(mo.group(1)))
+        except ValueError:
+            # Leave out of range values to dateutil
+            return None
+
+        for fmt in self._fast_formats:
+            try:
+                d = datetime.datetime.strptime(s, fmt)
+            except ValueError:
+                continue
+            if "%Y" not in fmt:
+                # Like dateutil, take the missing year from the default
+                d = d.replace(year=self.default.year)
+            return d
+        return None
 
     def log_parse_error(self, lineno: int, msg: str) -> None:
         self.errors.append(f"line {lineno + 1}: {msg}")
 
     def parse_date(self, s: str) -> datetime.datetime | None:
+        cache = LogParser._date_cache
+        key = (s, self.default, self.lang, self._fast_formats)
         try:
-            d = dateutil.parser.parse(s, default=self.default, parserinfo=self.parserinfo)
-        except (TypeError, ValueError):
+            d = cache[key]
+        except KeyError:
+            if len(cache) >= self.DATE_CACHE_SIZE:
+                cache.clear()
+            d = cache[key] = self._parse_date_uncached(s)
+        if d is None:
             return None
         self.default = d.replace(hour=0, minute=0, second=0, microsecond=0)
         return d
 
+    def _parse_date_uncached(self, s: str) -> datetime.datetime | None:
+        if (d := self._parse_date_fast(s.strip())) is not None:
+            return d
+        try:
+            return self._dateutil_parser.parse(s, default=self.default)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def get_dispatch_re(cls) -> re.Pattern:
+        """
+        Return a regular expression matching the start line of any of the
+        entry types, as an alternation of their start line regular
+        expressions, tried in order.
+
+        Named groups are renamed so that they are unique across the
+        alternatives: use match_start_line() to get the entry type and the
+        original group names.
+
+        The regular expression is rebuilt if ENTRY_TYPES changes.
+        """
+        key = tuple((c, c.start_line_regexes) for c in cls.ENTRY_TYPES)
+        if cls._dispatch_re is not None and key == cls._dispatch_key:
+            return cls._dispatch_re
+
+        alternatives: list[str] = []
+        tags: list[tuple[str, type[EntryBase], re.Pattern]] = []
+        for c in cls.ENTRY_TYPES:
+            for regex in c.start_line_regexes:
+                assert not (
+                    regex.flags & ~cls.DISPATCH_FLAGS
+                ), f"{c.__name__}: unsupported flags in start line regexp {regex.pattern!r}"
+                tag = f"{c.__name__}{len(tags)}"
+                pattern = re.sub(r"\(\?P<(\w+)>", rf"(?P<{tag}_\1>", regex.pattern)
+                # Carry over the flags of the original regexp
+                if regex.flags & re.VERBOSE:
+                    # Terminate a possible trailing comment
+                    pattern = f"(?x:{pattern}\n)"
+                if regex.flags & re.ASCII:
+                    pattern = f"(?a:{pattern})"
+                alternatives.append(f"(?P<{tag}>{pattern})")
+                tags.append((tag, c, regex))
+        dispatch_re = re.compile("|".join(alternatives))
+
+        info = {}
+        for tag, c, regex in tags:
+            prefix = tag + "_"
+            fields = [(name, dispatch_re.groupindex[prefix + name]) for name in regex.groupindex]
+            info[tag] = (c, fields)
+
+        cls._dispatch_info = info
+        cls._dispatch_re = dispatch_re
+        cls._dispatch_key = key
+        return dispatch_re
+
+    @classmethod
+    def match_start_line(cls, line: str) -> tuple[type[EntryBase], dict[str, Any]] | None:
+        """
+        Match line against the start lines of all the entry types.
+
+        Return the entry type and a dict with the values of its named groups,
+        or None if the line does not start any entry.
+        """
+        mo = cls.get_dispatch_re().match(line)
+        if mo is None:
+            return None
+        assert mo.lastgroup is not None
+        c, fields = cls._dispatch_info[mo.lastgroup]
+        groups = mo.groups()
+        return c, {name: groups[idx - 1] for name, idx in fields}
+
     def parse_entries(self) -> Generator[EntryBase, None, None]:
+        # This is the main parsing loop: look up the dispatch regexp and
+        # methods once, and inline match_start_line
+        match = self.get_dispatch_re().match
+        dispatch_info = self._dispatch_info
+        peek = self.lines.peek
         while True:
-            line = self.lines.peek()
+            line = peek()
             if not line:
                 break
 
-            for c in self.ENTRY_TYPES:
-                mo = c.is_start_line(line)
-                if mo:
-                    el = c.parse(self, **mo.groupdict())
-                    if el is not None:
-                        yield el
-                    break
-            else:
+            if (mo := match(line)) is None:
                 self.log_parse_error(self.lines.lineno, "log parse stops at unrecognised line " + repr(line))
                 break
 
+            assert mo.lastgroup is not None
+            c, fields = dispatch_info[mo.lastgroup]
+            groups = mo.groups()
+            el = c.parse(self, **{name: groups[idx - 1] for name, idx in fields})
+            if el is not None:
+                yield el
+
     def parse_tags(self, lineno: int, notes: str) -> list[str]:
         """Parse tags at the end of an entry head line."""
         tags: list[str] = []
         if notes:
             for note in notes.split():
-                if note[0] == "+":
+                c = note[0]
+                if c == "+":
                     tags.append(note[1:])
-                elif note[0] == "[":
+                elif c == "[":
                     # Ignore project name
                     pass
-                elif note[0].isdigit():
+                elif "0" <= c <= "9":
                     # Ignore hour count
                     pass
                 else:
-                    self.log_parse_error(entry_lineno, f"unrecognised annotation {repr(note)}")
+                    self.log_parse_error(lineno, f"unrecognised annotation {repr(note)}")
         return tags
 
 
+@lru_cache(maxsize=2048)
 def parsetime(s: str) -> datetime.time:
     """
     Parse a time in the form hh:mm, and return the corresponding datetime.time
     """
-    h, m = s.split(":")
+    # Logs use few distinct times, and datetime.time is immutable, so results
+    # are cached and shared
+    h, m = s.split(":", 1)
     return datetime.time(int(h), int(m), 0)
 
 
@@ -86,6 +266,10 @@ class EntryBase:
     Base class for log entries
     """
 
+    # Regular expressions matching the first line of this type of entry, used
+    # by LogParser to detect the start of entries
+    start_line_regexes: tuple[re.Pattern, ...] = ()
+
     def __init__(self, body: list[str] | None = None) -> None:
         # List of lines with the body of the log entry
         self.body: list[str]
@@ -123,16 +307,23 @@ class EntryBase:
     @classmethod
     def _read_body(cls, lines: Lines) -> list[str]:
         # Read entry body
-        body = []
+        body: list[str] = []
+        # Bind methods to locals, since this loop runs for every body line
+        append = body.append
+        peek = lines.peek
+        next_line = lines.next
+        is_entry_start = Entry.is_start_line
         while True:
-            line = lines.peek()
+            line = peek()
             if not line:
                 break
             if not line[0].isspace():
                 break
-            if Entry.is_start_line(line):
+            # The only entry headers starting with a space are those starting
+            # with " \d": only check the other lines against Entry when needed
+            if line[0] == " " and line[1:2].isdigit() and is_entry_start(line):
                 break
-            body.append(lines.next())
+            append(next_line())
         return body
 
     def print(self, file: IO[str] = sys.stdout) -> None:
@@ -152,7 +343,8 @@ class Timebase(EntryBase):
     Log entry providing a time reference for the next log entries
     """
 
-    re_timebase = re.compile(r"^(?:(?P<year>\d{4})|-+\s*(?P<date>.+?))\s*$")
+    re_timebase = re.compile(r"^(?:(?P<year>\d{4})|-+\s*(?P<date>.+?))\s*$", re.ASCII)
+    start_line_regexes = (re_timebase,)
 
     def __init__(self, line: str, dt: datetime.datetime) -> None:
         super().__init__()
@@ -163,7 +355,7 @@ class Timebase(EntryBase):
         return self.dt
 
     def print(self, file: IO[str] = sys.stdout) -> None:
-        print(self.line, file=file)
+        file.write(self.line + "\n")
 
     def print_lead_timeref(self, file: IO[str] | None = None) -> None:
         # Nothing to do, since a timebase is a full time reference
@@ -171,10 +363,16 @@ class Timebase(EntryBase):
 
     @classmethod
     def parse(cls, logparser: LogParser, **kw: Any) -> Self:
-        val: str = kw["date"] or kw["year"]
-        # Just parse the next line, storing it nowhere, but updating
-        # the 'default' datetime context
-        dt = logparser.parse_date(val)
+        dt: datetime.datetime | None
+        year = kw["year"]
+        if year and int(year) >= datetime.MINYEAR:
+            # A year line needs no date parsing
+            dt = datetime.datetime(int(year), 1, 1)
+            logparser.default = dt
+        else:
+            # Just parse the next line, storing it nowhere, but updating
+            # the 'default' datetime context
+            dt = logparser.parse_date(kw["date"] or year)
         line = logparser.lines.next()
         if dt is None:
             return None
@@ -198,11 +396,13 @@ class Entry(EntryBase):
         r"(?P<date>(?:\S| \d)[^:]*):\s*"  # Date header
         r"(?:(?P<trange>(?P<start>\d+:\d+)\s*-\s*(?P<end>\d+:\d+)?)?)\s*"  # Optional time interval
         r"(?P<notes>(?:(?:\+\S+|\[[^]]+\]|\d+[a-z]+)\s*)*)"  # Tags and project name
-        r"$"
+        r"$",
+        re.ASCII,
     )
     re_projname = re.compile(r"\s*\[[^]]+\]\s*$")
     re_tag = re.compile(r"\s*\+\S+\s*$")
     re_hours = re.compile(r"^")
+    start_line_regexes = (re_entry,)
 
     def __init__(
         self,
@@ -211,7 +411,9 @@ class Entry(EntryBase):
         head: str | None,
         body: list[str],
         fullday: bool,
-        tags: list[str] = [],
+        tags: list[str] | None = None,
+        date_str: str | None = None,
+        trange_str: str | None = None,
     ) -> None:
         super().__init__(body)
         # Datetime of beginning of log entry timespan
@@ -223,7 +425,13 @@ class Entry(EntryBase):
         # If true, the entry spans the whole day
         self.fullday = fullday
         # Log entry tags
-        self.tags = tags
+        self.tags: list[str] = tags if tags is not None else []
+        # Date and time range parts of the head, as written in the log. If not
+        # given, they are extracted from head when needed
+        self.date_str = date_str
+        self.trange_str = trange_str
+        # Cached duration in minutes, set on first access for closed entries
+        self._duration: int | None = None
 
     def __repr__(self) -> str:
         return f"Entry({self.begin!r}, {self.until!r}, {self.head!r}, {self.fullday!r}, {self.tags!r})"
@@ -263,16 +471,30 @@ class Entry(EntryBase):
         """
         Return the duration in minutes
         """
+        return self.get_duration()
+
+    def get_duration(self, now: datetime.datetime | None = None) -> int:
+        """
+        Return the duration in minutes.
+
+        now is used as the end of open entries, and defaults to the current
+        time: pass it to compute durations of many entries at the same time.
+        """
+        if self._duration is not None:
+            return self._duration
+
         if self.fullday:
-            return 24 * 60
+            self._duration = 24 * 60
+            return self._duration
 
         if not self.until:
-            until = datetime.datetime.now()
-        else:
-            until = self.until
+            # The duration of open entries changes with time, and is not cached
+            if now is None:
+                now = datetime.datetime.now()
+            return int((now - self.begin).total_seconds() // 60)
 
-        td = until - self.begin
-        return (td.days * 86400 + td.seconds) // 60
+        self._duration = int((self.until - self.begin).total_seconds() // 60)
+        return self._duration
 
     @property
     def formatted_duration(self) -> str:
@@ -282,12 +504,15 @@ class Entry(EntryBase):
         print(self.begin.year, file=file)
 
     def print(self, file: IO[str] = sys.stdout, project: project.Project | None = None):
-        mo = self.re_entry.match(self.head)
-        if not mo:
-            raise RuntimeError("Header line was parsed right during parsing, and not during printing")
-        line = [mo.group("date") + ":"]
+        if self.date_str is None:
+            mo = self.re_entry.match(self.head)
+            if not mo:
+                raise RuntimeError("Header line was parsed right during parsing, and not during printing")
+            self.date_str = mo.group("date")
+            self.trange_str = mo.group("trange")
+        line = [self.date_str + ":"]
         if not self.fullday:
-            line.append(mo.group("trange"))
+            line.append(self.trange_str)
             if self.until:
                 line.append(format_duration(self.duration))
 
@@ -296,10 +521,11 @@ class Entry(EntryBase):
         if project is not None:
             line.append("[%s]" % project.name)
 
-        print(" ".join(line), file=file)
-
-        for bline in self.body:
-            print(bline, file=file)
+        # Write head and body at once
+        out = [" ".join(line)]
+        out.extend(self.body)
+        out.append("")
+        file.write("\n".join(out))
 
     @classmethod
     def parse(cls, logparser: LogParser, **kw):
@@ -328,25 +554,28 @@ class Entry(EntryBase):
                 until = datetime.datetime.combine(date, parsetime(end))
                 if until < begin:
                     # Deal with intervals across midnight
-                    until += datetime.timedelta(days=1)
+                    until += ONE_DAY
             else:
                 until = None
             fullday = False
         else:
-            begin = datetime.datetime.combine(date, datetime.time(0))
-            until = begin + datetime.timedelta(days=1)
+            begin = datetime.datetime.combine(date, MIDNIGHT)
+            until = begin + ONE_DAY
             fullday = True
 
         # Parse tags
         tags = logparser.parse_tags(entry_lineno, kw.get("notes"))
 
-        return cls(begin, until, head, body, fullday, tags)
+        return cls(begin, until, head, body, fullday, tags, date_str=kw["date"], trange_str=kw.get("trange"))
 
     @classmethod
     def is_start_line(cls, line: str) -> re.Match | None:
         """
         Check if the next line looks like the start of a log block
         """
+        # Entry headers always contain a colon: skip the regexp otherwise
+        if ":" not in line:
+            return None
         return cls.re_entry.match(line)
 
 
@@ -370,9 +599,10 @@ class Command(EntryBase):
         )
         $
         """,
-        re.X,
+        re.X | re.ASCII,
     )
-    re_new_day = re.compile(r"^\+\+?\s*$")
+    re_new_day = re.compile(r"^\+\+?\s*$", re.ASCII)
+    start_line_regexes = (re_new_time, re_new_day)
 
     def __init__(
         self,
@@ -380,33 +610,32 @@ class Command(EntryBase):
         body: list[str],
         start: datetime.time | None = None,
         end: datetime.time | None = None,
-        tags: list[str] = [],
+        tags: list[str] | None = None,
     ):
         super().__init__(body)
         self.head = head
         self.start = start
         self.end = end
-        self.tags = tags
+        self.tags: list[str] = tags if tags is not None else []
 
     def reference_time(self) -> datetime.datetime | None:
         return None
 
     def sync(self, project: project.Project, today: datetime.date) -> EntryBase:
-        date_format = project.config.date_format + ":"
-        datetime_format = date_format + " " + project.config.time_format + "-"
+        config = project.config
         if self.start is None:
-            begin = datetime.datetime.combine(today, datetime.time(0))
-            until = begin + datetime.timedelta(days=1)
-            head = begin.strftime(date_format)
+            begin = datetime.datetime.combine(today, MIDNIGHT)
+            until = begin + ONE_DAY
+            head = begin.strftime(config.log_date_format)
             res = Entry(begin, until, head, self.body, True)
             if self.head == "++":
                 self.body.append(" +")
         else:
             begin = datetime.datetime.combine(today, self.start)
-            head = begin.strftime(datetime_format)
+            head = begin.strftime(config.log_datetime_format)
             if self.end is not None:
                 until = datetime.datetime.combine(today, self.end)
-                head += until.strftime(project.config.time_format)
+                head += until.strftime(config.time_format)
             else:
                 until = None
             res = Entry(begin, until, head, self.body, False, tags=self.tags)
@@ -422,9 +651,11 @@ class Command(EntryBase):
         )
 
     def print(self, file: IO[str] = sys.stdout) -> None:
-        print(self.head, file=file)
-        for line in self.body:
-            print(line, file=file)
+        # Write head and body at once
+        out = [self.head]
+        out.extend(self.body)
+        out.append("")
+        file.write("\n".join(out))
 
     @classmethod
     def parse(cls, logparser: LogParser, **kw: Any) -> Self:
@@ -479,7 +710,7 @@ class LogPrinter:
             return
         this_year = self.today.year
         if self.last_reference_time is None or self.last_reference_time.year != this_year:
-            print(this_year, file=self.file)
+            self.file.write(f"{this_year}\n")
 
 
 class Log:
@@ -493,38 +724,48 @@ class Log:
         self._lineno: int | None = None
         # Array of Entry
         self._entries: list[EntryBase] = []
+        # Indices in _entries of the Entry elements
+        self._entry_indices: list[int] = []
+
+    def _reindex(self) -> None:
+        """
+        Rebuild the list of indices of Entry elements in _entries
+        """
+        self._entry_indices = [idx for idx, e in enumerate(self._entries) if isinstance(e, Entry)]
+
+    def set_entries(self, entries: list[EntryBase]) -> None:
+        """
+        Replace the contents of the log
+        """
+        self._entries = entries
+        self._reindex()
 
     @property
     def entries(self) -> Generator[Entry, None, None]:
         """
         Generate all the Entry entries of this log
         """
-        for e in self._entries:
-            if not isinstance(e, Entry):
-                continue
-            yield e
+        entries = self._entries
+        for idx in self._entry_indices:
+            yield cast(Entry, entries[idx])
 
     @property
     def first_entry(self) -> Entry | None:
         """
         Return the first Entry of the log
         """
-        for e in self._entries:
-            if not isinstance(e, Entry):
-                continue
-            return e
-        return None
+        if not self._entry_indices:
+            return None
+        return cast(Entry, self._entries[self._entry_indices[0]])
 
     @property
     def last_entry(self) -> Entry | None:
         """
         Return the last Entry of the log
         """
-        for e in self._entries[::-1]:
-            if not isinstance(e, Entry):
-                continue
-            return e
-        return None
+        if not self._entry_indices:
+            return None
+        return cast(Entry, self._entries[self._entry_indices[-1]])
 
     def detach_entries(self, since: datetime.date, until: datetime.date) -> list[EntryBase]:
         """
@@ -533,10 +774,8 @@ class Log:
         """
         first = None
         last = None
-        for idx, e in enumerate(self._entries):
-            if not isinstance(e, Entry):
-                continue
-            if e.begin.date() >= since and e.begin.date() < until:
+        for idx in self._entry_indices:
+            if since <= cast(Entry, self._entries[idx]).begin.date() < until:
                 if first is None:
                     first = idx
                     last = idx
@@ -557,18 +796,29 @@ class Log:
             and isinstance(self._entries[first], Timebase)
         ):
             self._entries.pop(first - 1)
+        self._reindex()
         return res
 
-    def durations(self) -> Counter:
+    def durations(self, now: datetime.datetime | None = None) -> dict[str, int]:
         """
-        Compute durations, total and by tag
+        Compute durations, total and by tag.
+
+        now is used as the end of open entries, and defaults to the current
+        time.
         """
-        res: Counter = Counter()
+        res: dict[str, int] = defaultdict(int)
+        if not self._entry_indices:
+            return res
+        if now is None:
+            now = datetime.datetime.now()
+        # Accumulate the total in a local variable instead of the dict
+        total = 0
         for e in self.entries:
-            duration = e.duration
-            res[""] += duration
+            duration = e.get_duration(now)
+            total += duration
             for tag in e.tags:
                 res[tag] += duration
+        res[""] = total
         return res
 
     def sync(self, today: datetime.date | None = None) -> None:
@@ -578,16 +828,26 @@ class Log:
         if today is None:
             today = utils.today()
         with self.project.set_locale():
-            new_entries = []
-            for e in self._entries:
-                new_entries.append(e.sync(self.project, today=today))
-            self._entries = new_entries
+            # Replace entries in place, without building a new list
+            entries = self._entries
+            changed = False
+            for idx, e in enumerate(entries):
+                new = e.sync(self.project, today=today)
+                if new is not e:
+                    entries[idx] = new
+                    changed = True
+        # Syncing can turn commands into entries
+        if changed:
+            self._reindex()
 
     def parse(self, lines: Lines, lang: str | None = None) -> None:
         self._lineno = lines.lineno
 
-        log_parser = LogParser(lines, lang)
+        date_format = self.project.config.date_format if self.project.config is not None else None
+        log_parser = LogParser(lines, lang, date_format=date_format)
         for el in log_parser.parse_entries():
+            if isinstance(el, Entry):
+                self._entry_indices.append(len(self._entries))
             self._entries.append(el)
 
         if log_parser.errors:
@@ -604,8 +864,9 @@ class Log:
         """
         # self.project.set_locale()
         printer = LogPrinter(file, today=today, archived=self.project.archived)
+        print_entry = printer.print
         for entry in self._entries:
-            printer.print(entry)
+            print_entry(entry)
         printer.done()
         return True
 
@@ -4,6 +4,7 @@ import datetime
 import inspect
 import re
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any, IO
 
@@ -19,6 +20,11 @@ class Meta:
     """
 
     re_meta_head = re.compile(r"^\w.*:")
+    # Field names follow the syntax of email header names
+    re_field = re.compile(r"^([\x21-\x39\x3b-\x7e]+):(.*)$")
+    re_ymd = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})$", re.ASCII)
+    # Turn tag separators into spaces, to split tags with str.split()
+    tag_separators = str.maketrans(",\t", "  ")
 
     def __init__(self) -> None:
         # Line number in the project file where the metadata start
@@ -62,13 +68,24 @@ class Meta:
         """
         return self._raw.get("archived", "false").lower() in ("true", "yes")
 
+    @classmethod
+    def _parse_ymd(cls, s: str) -> datetime.date:
+        """
+        Parse a YYYY-MM-DD date, without going through strptime for the
+        common case
+        """
+        if mo := cls.re_ymd.match(s):
+            return datetime.date(int(mo.group(1)), int(mo.group(2)), int(mo.group(3)))
+        # Let strptime deal with, and report, anything else
+        return datetime.datetime.strptime(s, "%Y-%m-%d").date()
+
     @property
     def start_date(self) -> datetime.date | None:
         """
         Return the explicit begin date of this project
         """
         if (since_str := self._raw.get("start-date", None)) is not None:
-            return datetime.datetime.strptime(since_str, "%Y-%m-%d").date()
+            return self._parse_ymd(since_str)
         else:
             return None
 
@@ -78,7 +95,7 @@ class Meta:
         Return the explicit end date of this project
         """
         if (since_str := self._raw.get("end-date", None)) is not None:
-            return datetime.datetime.strptime(since_str, "%Y-%m-%d").date()
+            return self._parse_ymd(since_str)
         else:
             return None
 
@@ -133,6 +150,34 @@ class Meta:
                 lines.append(f"{tag}: {format_duration(duration)}")
             self.set("total", "\n".join(lines))
 
+    @classmethod
+    def _parse_fields(cls, lines: list[str]) -> Iterator[tuple[str, str]]:
+        """
+        Split lines into (name, value) fields, in the same way as email
+        headers: lines starting with whitespace continue the value of the
+        previous field, envelope ("From ") lines and lines with an empty
+        field name are skipped, and parsing stops at the first other line
+        that is not a field.
+        """
+        name: str | None = None
+        value: list[str] = []
+        for line in lines:
+            if line[:1] in (" ", "\t"):
+                if name is not None:
+                    value.append(line)
+                continue
+            if name is not None:
+                yield name, "\n".join(value)
+                name = None
+            if line.startswith(("From ", ":")):
+                continue
+            if not (mo := cls.re_field.match(line)):
+                break
+            name = mo.group(1)
+            value = [mo.group(2).lstrip(" \t")]
+        if name is not None:
+            yield name, "\n".join(value)
+
     def parse(self, lines: Lines) -> None:
         """
         Parse a metadata section from a Lines object
@@ -140,29 +185,26 @@ class Meta:
         # Parse raw lines
         self._lineno = lines.lineno
 
-        # Get everything until we reach an empty line
-        meta_lines: list[str] = []
-        while True:
-            # Stop at an empty line or at EOF
-            if not lines.peek():
-                lines.skip_empty_lines()
-                break
-            meta_lines.append(lines.next())
+        # Get everything until we reach an empty line or EOF
+        meta_lines = lines.next_block()
+        lines.skip_empty_lines()
 
         # Parse fields in the same way as email headers
-        import email
-
-        for k, v in email.message_from_string("\n".join(meta_lines)).items():
-            if v is None:
-                continue
-            self._raw[k.lower()] = inspect.cleandoc(str(v))
+        for k, v in self._parse_fields(meta_lines):
+            if "\n" in v or "\t" in v:
+                # Dedent continuation lines and expand tabs
+                v = inspect.cleandoc(v)
+            else:
+                # Most fields are single line: skip cleandoc for them
+                v = v.strip()
+            self._raw[k.lower()] = v
 
         # Extract well known values
 
         # Tags
         f = self._raw.get("tags", None)
         if f is not None:
-            self.tags.update(re.split(r"[ ,\t]+", f))
+            self.tags.update(f.translate(self.tag_separators).split())
 
     def print(self, file: IO[str] = sys.stdout) -> bool:
         """
@@ -172,16 +214,19 @@ class Meta:
         Returns True if the metadata section was printed, False if there was
         nothing to print.
         """
-        res = False
+        if not self._raw:
+            return False
+        out: list[str] = []
         for name, value in self._raw.items():
-            res = True
             if "\n" in value:
-                print(f"{name.title()}:", file=file)
-                for line in value.splitlines():
-                    print(" " + line, file=file)
+                out.append(f"{name.title()}:")
+                out.extend(" " + line for line in value.splitlines())
             else:
-                print(f"{name.title()}: {value.strip()}", file=file)
-        return res
+                out.append(f"{name.title()}: {value.strip()}")
+        # Write all fields at once
+        out.append("")
+        file.write("\n".join(out))
+        return True
 
     @classmethod
     def is_start_line(cls, line: str) -> bool:
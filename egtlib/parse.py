@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 from collections.abc import Generator
 from pathlib import Path
 from typing import IO
@@ -19,9 +20,24 @@ class Lines:
         self.lines: list[str]
         if fd is None:
             with self.path.open("r") as fd:
-                self.lines = [x.rstrip() for x in fd]
+                self.lines = self._split(fd.read())
         else:
-            self.lines = [x.rstrip() for x in fd]
+            self.lines = self._split(fd.read())
+
+    @staticmethod
+    def _split(text: str) -> list[str]:
+        """
+        Split the file contents in trimmed lines.
+
+        Splitting the result of a single read() is faster than iterating the
+        file, and gives the same lines since text files use universal
+        newlines.
+        """
+        lines = text.split("\n")
+        # Drop the empty string after the final newline
+        if not lines[-1]:
+            lines.pop()
+        return list(map(str.rstrip, lines))
 
     def peek(self) -> str | None:
         """
@@ -44,11 +60,25 @@ class Lines:
         self.lineno += 1
         return res
 
+    def next_block(self) -> list[str]:
+        """
+        Return all lines until the next empty line or the end of the input,
+        advancing the cursor past them
+        """
+        lines = self.lines
+        start = end = self.lineno
+        size = len(lines)
+        while end < size and lines[end]:
+            end += 1
+        self.lineno = end
+        return lines[start:end]
+
     def rest(self) -> Generator[str, None, None]:
         """
         Generate all remaining lines
         """
-        yield from self.lines[self.lineno :]
+        # Iterate the remaining lines without copying them to a new list
+        yield from itertools.islice(self.lines, self.lineno, None)
 
     def discard(self) -> None:
         """
@@ -7,15 +7,25 @@ import logging
 import os.path
 import subprocess
 import sys
+from collections import deque
 from collections.abc import Iterator
 from pathlib import Path
 from typing import IO, Any, Self, cast
 
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ModuleNotFoundError:
+    HAS_ORJSON = False
+
+from . import system, utils
 from .body import Body
 from .config import Config
 from .lang import set_locale
 from .log import Log
 from .meta import Meta
+from .parse import Lines
 from .utils import atomic_writer, format_duration, stream_output, today
 
 log = logging.getLogger(__name__)
@@ -44,18 +54,28 @@ class ProjectState:
         self._save()
 
     def _load(self) -> dict[str, Any]:
-        if not self.abspath.exists():
+        try:
+            data = self.abspath.read_bytes()
+        except FileNotFoundError:
+            return {}
+        if HAS_ORJSON:
+            state = orjson.loads(data)
+        else:
+            state = json.loads(data)
+        if not isinstance(state, dict):
+            log.error("%s: JSON data is not a dict: ignoring", self.abspath)
             return {}
-        with self.abspath.open("r") as fd:
-            state = json.load(fd)
-            if not isinstance(state, dict):
-                log.error("%s: JSON data is not a dict: ignoring", self.abspath)
-                return {}
-            return state
+        return state
 
     def _save(self) -> None:
-        with atomic_writer(self.abspath, "wt") as fd:
-            json.dump(self._state, fd, indent=1)
+        # Both backends write the same format. Non-string keys, like task
+        # ids, are converted to strings as json does
+        if HAS_ORJSON:
+            data = orjson.dumps(self._state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            data = json.dumps(self._state, indent=2, ensure_ascii=False).encode()
+        with atomic_writer(self.abspath, "wb") as fd:
+            fd.write(data)
 
 
 class Project:
@@ -84,6 +104,14 @@ class Project:
         # Project state, loaded lazily, None if not loaded
         self._state: ProjectState | None = None
 
+        # stat() of the project file, read lazily by _stat(), None if not
+        # read yet
+        self._stat_result: os.stat_result | None = None
+
+        # .git directories below the project path, found lazily by gitdirs(),
+        # None if not searched yet
+        self._gitdirs: list[Path] | None = None
+
         self.meta = Meta()
         self.log = Log(self)
         self.body = Body(self)
@@ -108,13 +136,9 @@ class Project:
         if not self.archived:
             return name
 
-        since, until = self.formal_period
-        if until:
-            return f"{name}-{until:%Y-%m-%d}"
-        elif since:
-            return f"{name}-{since:%Y-%m-%d}"
-        else:
-            return name
+        # The end of the formal period is always set, so there is no need to
+        # compute its start
+        return f"{name}-{self.formal_end:%Y-%m-%d}"
 
     @property
     def path(self) -> Path:
@@ -123,9 +147,19 @@ class Project:
     @property
     def mtime(self) -> float:
         """
-        Returh the modification time of the .egt file
+        Returh the modification time of the .egt file.
+
+        The value is read once and cached until the project is saved.
+        """
+        return self._stat().st_mtime
+
+    def _stat(self) -> os.stat_result:
+        """
+        Return the stat() of the .egt file, cached until the project is saved
         """
-        return os.path.getmtime(self.abspath)
+        if self._stat_result is None:
+            self._stat_result = os.stat(self.abspath)
+        return self._stat_result
 
     @property
     def tags(self) -> set[str]:
@@ -151,8 +185,6 @@ class Project:
         return p
 
     def load(self, fd: IO[str] | None = None) -> None:
-        from .parse import Lines
-
         lines = Lines(self.abspath, fd=fd)
 
         # Parse optionalmetadata
@@ -196,8 +228,6 @@ class Project:
         Serialize the whole project as a project file to the given file
         descriptor.
         """
-        from . import utils
-
         if today is None:
             today = utils.today()
 
@@ -215,25 +245,45 @@ class Project:
         """
         with atomic_writer(self.abspath, "wt") as fd:
             self.print(cast(IO[str], fd), today)
+        self._stat_result = None
 
     @property
     def last_updated(self) -> datetime.datetime | None:
         """
         Datetime when this project was last updated
         """
+        return self.get_last_updated()
+
+    def get_last_updated(self, now: datetime.datetime | None = None) -> datetime.datetime | None:
+        """
+        Datetime when this project was last updated.
+
+        now is returned if the last log entry is still open, and defaults to
+        the current time.
+        """
         last = self.log.last_entry
         if last is None:
             return None
         if last.until:
             return last.until
-        return datetime.datetime.now()
+        if now is None:
+            now = datetime.datetime.now()
+        return now
 
     @property
     def elapsed(self) -> int:
-        mins = 0
-        for entry in self.log.entries:
-            mins += entry.duration
-        return mins
+        return self.get_elapsed()
+
+    def get_elapsed(self, now: datetime.datetime | None = None) -> int:
+        """
+        Return the total duration of the log in minutes.
+
+        now is used as the end of open entries, and defaults to the current
+        time.
+        """
+        if now is None:
+            now = datetime.datetime.now()
+        return sum(entry.get_duration(now) for entry in self.log.entries)
 
     @property
     def formatted_elapsed(self) -> str:
@@ -251,66 +301,128 @@ class Project:
         If Start-date and End-date are provided in the metadata, return those.
         Else infer them from the first or last log entries.
         """
+        return self.get_formal_period()
+
+    def get_formal_period(self, now: datetime.date | None = None) -> tuple[datetime.date, datetime.date]:
+        """
+        Compute the begin and end dates for this project.
+
+        now is used for dates that cannot be inferred from metadata or log
+        entries, and defaults to the current date.
+        """
+        start = self._formal_start()
+        end = self._formal_end()
+        if start is None or end is None:
+            if now is None:
+                now = today()
+            if start is None:
+                start = now
+            if end is None:
+                end = now
+        return start, end
+
+    @property
+    def formal_end(self) -> datetime.date:
+        """
+        Compute the end date for this project, from End-date or from the last
+        log entry
+        """
+        return self._formal_end() or today()
+
+    def _formal_start(self) -> datetime.date | None:
         if date := self.meta.start_date:
-            since = date
+            return date
         elif (e := self.log.first_entry) is not None:
-            since = e.begin.date()
-        else:
-            since = today()
+            return e.begin.date()
+        return None
 
+    def _formal_end(self) -> datetime.date | None:
         if date := self.meta.end_date:
-            until = date
-        elif (e := self.log.last_entry) is not None:
-            until = e.until.date() if e.until is not None else today()
-        else:
-            until = today()
-
-        return since, until
+            return date
+        elif (e := self.log.last_entry) is not None and e.until is not None:
+            return e.until.date()
+        return None
 
     def spawn_terminal(self, with_editor=False) -> None:
-        from .system import run_work_session
-
-        run_work_session(self, with_editor)
+        system.run_work_session(self, with_editor)
 
     def run_editor(self) -> None:
-        from .system import run_editor
-
-        run_editor(self)
+        system.run_editor(self)
 
     def run_grep(self, args: list[str]) -> None:
+        cmd = ["git", "grep"] + args
+        # Run greps on multiple git dirs in parallel, printing their output
+        # in order as each one completes
+        max_running = os.cpu_count() or 1
+        running: deque[subprocess.Popen] = deque()
         for gd in self.gitdirs():
+            if len(running) >= max_running:
+                self._print_grep_output(running.popleft())
             cwd = gd.parent.absolute()
-            cmd = ["git", "grep"] + args
             log.info("%s: git grep %s", cwd, " ".join(cmd))
-            p = subprocess.Popen(
-                cmd, cwd=cwd.as_posix(), close_fds=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            running.append(
+                subprocess.Popen(
+                    cmd, cwd=cwd.as_posix(), close_fds=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                )
             )
-            for ltype, line in stream_output(p):
-                if ltype == "stdout":
-                    print(f"{self.name}:{line}", file=sys.stdout)
-                elif ltype == "stderr":
-                    print(f"{self.name}:{line}", file=sys.stderr)
+        while running:
+            self._print_grep_output(running.popleft())
+
+    def _print_grep_output(self, proc: subprocess.Popen) -> None:
+        """
+        Print the output of a git grep process, prefixed with the project name
+        """
+        # Compute the prefix once, since name is a computed property
+        prefix = self.name + ":"
+        stdout = sys.stdout
+        stderr = sys.stderr
+        for ltype, line in stream_output(proc):
+            if ltype == "stdout":
+                stdout.write(f"{prefix}{line}\n")
+            elif ltype == "stderr":
+                stderr.write(f"{prefix}{line}\n")
+
+    def gitdirs(self, depth: int = 2, root: Path | None = None) -> list[Path]:
+        """
+        Find all .git directories below the project path.
+
+        The result with the default arguments is cached, since backup and
+        grep may need it more than once during the same run.
+        """
+        if depth == 2 and root is None:
+            if self._gitdirs is None:
+                self._gitdirs = list(self._find_gitdirs(depth, self.path))
+            return self._gitdirs
+        return list(self._find_gitdirs(depth, root if root is not None else self.path))
 
-    def gitdirs(self, depth: int = 2, root: Path | None = None) -> Iterator[Path]:
+    def _find_gitdirs(self, depth: int, root: Path) -> Iterator[Path]:
         """
-        Find all .git directories below the project path
+        Generate all .git directories below root, recursing depth levels
         """
-        # Default to self.path
-        if root is None:
-            root = self.path
+        if depth <= 1:
+            # Only check the current dir
+            cand = root / ".git"
+            if cand.is_dir():
+                yield cand
+            return
+
+        # Scan the directory once, using the file types from scandir to find
+        # both .git and the subdirs to recurse into
+        has_git = False
+        subdirs: list[str] = []
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.name == ".git":
+                    has_git = entry.is_dir()
+                elif not entry.name.startswith(".") and entry.is_dir():
+                    subdirs.append(entry.name)
 
-        # Check the current dir
-        cand = root / ".git"
-        if cand.is_dir():
-            yield cand
+        if has_git:
+            yield root / ".git"
 
-        # Recurse into subdirs if we still have some way to go
-        if depth > 1:
-            for sub in root.iterdir():
-                if sub.name.startswith("."):
-                    continue
-                if sub.is_dir():
-                    yield from self.gitdirs(depth - 1, sub)
+        # Recurse into subdirs
+        for name in subdirs:
+            yield from self._find_gitdirs(depth - 1, root / name)
 
     def backup(self, tarout) -> None:
         backup_paths = [x.strip() for x in self.meta.get("backup", "").split("\n")]
@@ -322,13 +434,13 @@ class Project:
         if ".git" not in backup_paths and not self.meta.get("abstract", False):
             for gd in self.gitdirs():
                 tarout.add(os.path.join(gd, "config"))
-                hookdir = os.path.join(gd, "hooks")
-                for fn in os.listdir(hookdir):
-                    if fn.startswith("."):
-                        continue
-                    if fn.endswith(".sample"):
-                        continue
-                    tarout.add(os.path.join(hookdir, fn))
+                with os.scandir(gd / "hooks") as it:
+                    for entry in it:
+                        if entry.name.startswith("."):
+                            continue
+                        if entry.name.endswith(".sample"):
+                            continue
+                        tarout.add(entry.path)
             # TODO: a shellscript with command to clone the .git again
             # TODO: a diff with uncommitted changes
             # (if you don't push, you don't back up, and it's fair enough)
@@ -344,7 +456,7 @@ class Project:
 
     def _create_archive(self, path: Path, start: datetime.date, end: datetime.date) -> Project | None:
         path = path.expanduser()
-        if path.exists():
+        if self.has_project(path):
             log.warn("%s not archived: %s already exists", self.name, path)
             return None
 
@@ -355,7 +467,7 @@ class Project:
 
         archived = Project(path, config=self.config)
         archived.meta = self.meta.copy()
-        archived.log._entries = entries
+        archived.log.set_entries(entries)
         archived.meta.set("archived", "yes")
         archived.meta.set_durations(archived.log.durations())
         archived.archived = True
@@ -405,15 +517,18 @@ class Project:
         if first_entry is None:
             log.info("%s not archived: log is empty", self.name)
         else:
-            # Get the datetime of the first Entry in the log
-            date = first_entry.begin.date()
-
-            # Iterate until cutoff
-            while date < cutoff:
+            if combined:
+                date = first_entry.begin.date()
+                months = [date.replace(day=1)] if date < cutoff else []
+            else:
+                # Only visit the months that have entries before the cutoff
+                months = sorted({d.replace(day=1) for e in self.log.entries if (d := e.begin.date()) < cutoff})
+
+            for month in months:
                 if combined:
-                    date, arc = self.archive_range(archive_dir, date.replace(day=1), cutoff)
+                    _, arc = self.archive_range(archive_dir, month, cutoff)
                 else:
-                    date, arc = self.archive_month(archive_dir, date)
+                    _, arc = self.archive_month(archive_dir, month)
                 if arc is not None:
                     archived.append(arc)
                     if report_fd is not None:
@@ -444,4 +559,8 @@ class Project:
 
     @classmethod
     def has_project(cls, path: Path) -> bool:
-        return path.exists()
+        try:
+            os.stat(path)
+        except OSError:
+            return False
+        return True
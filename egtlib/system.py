@@ -7,12 +7,22 @@ from __future__ import annotations
 import os
 import subprocess
 import sys
+from functools import cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .project import Project
 
 
+@cache
+def _devnull() -> int:
+    """
+    Return a file descriptor open on /dev/null, opened on first use and
+    shared by all spawned commands
+    """
+    return os.open(os.devnull, os.O_RDWR)
+
+
 def run_editor(proj: Project) -> None:
     """
     Edit the .egt file for the give Project
@@ -29,18 +39,8 @@ def run_work_session(proj: Project, with_editor: bool = True) -> None:
     Open a terminal on the working directory of the given project, optionally
     opening the project file in an editor inside the terminal
     """
-    pid = os.fork()
-    if pid > 0:
-        return
-
     argv0 = os.path.abspath(sys.argv[0])
 
-    # Move to the project directory
-    os.chdir(proj.path)
-
-    # Detach from terminal
-    os.setsid()
-
     cmdline = [
         "x-terminal-emulator",
     ]
@@ -50,10 +50,15 @@ def run_work_session(proj: Project, with_editor: bool = True) -> None:
         cmdline.append("edit")
         cmdline.append(proj.name)
 
-    # Close file descriptors
-    sys.stdin.close()
-    sys.stdout.close()
-    sys.stderr.close()
-    proc = subprocess.Popen(cmdline, cwd=proj.path, close_fds=True)
-    proc.wait()
-    sys.exit(0)
+    # Start the terminal in the project directory, in a new session detached
+    # from our terminal. Spawning it directly avoids forking the whole egt
+    # process, with all its loaded projects, just to run a command
+    subprocess.Popen(
+        cmdline,
+        cwd=proj.path,
+        close_fds=True,
+        start_new_session=True,
+        stdin=_devnull(),
+        stdout=_devnull(),
+        stderr=_devnull(),
+    )
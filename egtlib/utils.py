@@ -122,8 +122,14 @@ class TaskStatCol(SummaryCol):
 
 
 class HoursCol(SummaryCol):
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.now = datetime.datetime.now()
+
     def func(self, p: egtlib.Project) -> str:
-        return format_duration(p.elapsed, tabular=True) if p.last_updated else "--"
+        if p.get_last_updated(self.now) is None:
+            return "--"
+        return format_duration(p.get_elapsed(self.now), tabular=True)
 
 
 class LastEntryCol(SummaryCol):
@@ -132,8 +138,8 @@ class LastEntryCol(SummaryCol):
         self.now = datetime.datetime.now()
 
     def func(self, p: egtlib.Project) -> str:
-        if p.last_updated:
-            return format_td(self.now - p.last_updated, tabular=True) + " ago"
+        if (last_updated := p.get_last_updated(self.now)) is not None:
+            return format_td(self.now - last_updated, tabular=True) + " ago"
         else:
             return "--"
 
@@ -142,8 +148,7 @@ def format_duration(mins: int, tabular: bool = False) -> str:
     """
     Format a time duration in minutes
     """
-    h = mins // 60
-    m = mins % 60
+    h, m = divmod(mins, 60)
     if tabular:
         return f"{h:3d}h {m:02d}m"
     else:
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import datetime
 import io
+import re
 import unittest
 from typing import cast
+from unittest import mock
 
 from egtlib import Project
 from egtlib.config import Config
-from egtlib.log import Command, Entry, EntryBase, Timebase
+from egtlib.log import Command, Entry, EntryBase, LogParser, Timebase
+from egtlib.parse import Lines
 
 from .utils import ProjectTestMixin
 
@@ -148,6 +151,90 @@ class TestLog(ProjectTestMixin, unittest.TestCase):
             ],
         )
 
+    def test_parse_date(self) -> None:
+        parser = LogParser(Lines(self.projectfile, io.StringIO("")), date_format="%d %B")
+        self.assertEqual(parser.parse_date("2015"), datetime.datetime(2015, 1, 1))
+        self.assertEqual(parser.parse_date("15 march"), datetime.datetime(2015, 3, 15))
+        self.assertEqual(parser.parse_date(" 2 Apr"), datetime.datetime(2015, 4, 2))
+        self.assertEqual(parser.parse_date("2016-02-29"), datetime.datetime(2016, 2, 29))
+        self.assertEqual(parser.parse_date("29 february"), datetime.datetime(2016, 2, 29))
+        # Fall back to dateutil for other formats
+        self.assertEqual(parser.parse_date("march 3"), datetime.datetime(2016, 3, 3))
+        self.assertIsNone(parser.parse_date("not a date"))
+
+    def test_parse_date_fast_formats(self) -> None:
+        # Formats with names are left to dateutil, which does not depend on
+        # the process locale
+        parser = LogParser(Lines(self.projectfile, io.StringIO("")), date_format="%d %B %Y")
+        self.assertEqual(parser._fast_formats, LogParser.FAST_FORMATS)
+        parser = LogParser(Lines(self.projectfile, io.StringIO("")), date_format="%d/%m/%Y")
+        self.assertEqual(parser._fast_formats, ("%d/%m/%Y",) + LogParser.FAST_FORMATS)
+        self.assertEqual(parser.parse_date("15/03/2015"), datetime.datetime(2015, 3, 15))
+
+    def test_match_start_line(self) -> None:
+        self.assertEqual(LogParser.match_start_line("2015"), (Timebase, {"year": "2015", "date": None}))
+        self.assertEqual(LogParser.match_start_line("--- 3 march"), (Timebase, {"year": None, "date": "3 march"}))
+        self.assertEqual(
+            LogParser.match_start_line("15 march: 9:00-12:00 +tag"),
+            (
+                Entry,
+                {"date": "15 march", "trange": "9:00-12:00", "start": "9:00", "end": "12:00", "notes": "+tag"},
+            ),
+        )
+        self.assertEqual(
+            LogParser.match_start_line("8:00- +tag"), (Command, {"start": "8:00", "end": None, "notes": "+tag"})
+        )
+        self.assertEqual(LogParser.match_start_line("++"), (Command, {}))
+        self.assertIsNone(LogParser.match_start_line(" - body line"))
+
+    def test_dispatch_re_entry_types(self) -> None:
+        LogParser.get_dispatch_re()
+        with mock.patch.object(LogParser, "ENTRY_TYPES", list(LogParser.ENTRY_TYPES)):
+            # Entry types registered after the first use are picked up
+            class Marker(EntryBase):
+                start_line_regexes = (re.compile(r"^!!(?P<text>.*)$"),)
+
+            self.assertEqual(LogParser.match_start_line("!!test"), (Marker, {"text": "test"}))
+
+            # Flags that cannot be carried over are rejected
+            class Caseless(EntryBase):
+                start_line_regexes = (re.compile(r"^xx$", re.I),)
+
+            with self.assertRaises(AssertionError):
+                LogParser.get_dispatch_re()
+        self.assertIsNone(LogParser.match_start_line("!!test"))
+
+    def test_match_start_line_bracket_tags(self) -> None:
+        # A tag running into a project name needs backtracking to match
+        self.assertEqual(
+            LogParser.match_start_line("15 march: 9:00-10:00 +tag[my project]"),
+            (
+                Entry,
+                {
+                    "date": "15 march",
+                    "trange": "9:00-10:00",
+                    "start": "9:00",
+                    "end": "10:00",
+                    "notes": "+tag[my project]",
+                },
+            ),
+        )
+        self.assertIsNotNone(Entry.is_start_line("15 march: 9:00-10:00 +tag[my project]"))
+        self.assertEqual(
+            LogParser.match_start_line("9:00-10:00 +tag[my project]"),
+            (Command, {"start": "9:00", "end": "10:00", "notes": "+tag[my project]"}),
+        )
+        self.assertIsNotNone(Command.re_new_time.match("10:00+tag7march0[3[m march]"))
+
+    def test_get_duration(self) -> None:
+        begin = datetime.datetime(2015, 3, 15, 9)
+        entry = Entry(begin, None, "15 march: 9:00-", [], False)
+        self.assertEqual(entry.get_duration(now=datetime.datetime(2015, 3, 15, 10, 30)), 90)
+        self.assertEqual(entry.get_duration(now=datetime.datetime(2015, 3, 15, 11)), 120)
+        entry = Entry(begin, datetime.datetime(2015, 3, 15, 12), "15 march: 9:00-12:00", [], False)
+        self.assertEqual(entry.get_duration(now=datetime.datetime(2015, 3, 15, 10)), 180)
+        self.assertEqual(entry.duration, 180)
+
     def assertExpandEntry(self, entry: str, today=datetime.date(2015, 6, 1)) -> tuple[Project, Entry]:
         self.write_project(["2015", entry])
         proj = Project(self.projectfile, statedir=self.workdir, config=Config())
@@ -1,3 +1,4 @@
+import datetime
 import io
 import unittest
 from pathlib import Path
@@ -96,3 +97,28 @@ class TestMeta(unittest.TestCase):
                 "Tags: a,  b,  c",
             ],
         )
+
+    def test_dates(self) -> None:
+        meta = Meta()
+        meta.parse(Lines(Path("test/.egt"), io.StringIO("Start-date: 2019-3-1\nEnd-date: 2019-12-31\n")))
+        self.assertEqual(meta.start_date, datetime.date(2019, 3, 1))
+        self.assertEqual(meta.end_date, datetime.date(2019, 12, 31))
+
+        meta = Meta()
+        meta.parse(Lines(Path("test/.egt"), io.StringIO("Start-date: 2019-02-30\n")))
+        with self.assertRaises(ValueError):
+            meta.start_date
+        self.assertIsNone(meta.end_date)
+
+    def test_is_start_line(self) -> None:
+        self.assertTrue(Meta.is_start_line("Name: test"))
+        self.assertTrue(Meta.is_start_line("Übername: test"))
+        self.assertFalse(Meta.is_start_line("2019"))
+
+    def test_parse_skipped_lines(self) -> None:
+        # Like email headers, envelope lines and lines without a field name
+        # are skipped, and parsing continues with the following fields
+        meta = Meta()
+        meta.parse(Lines(Path("test/.egt"), io.StringIO("Name: test\nFrom foo\n:bar\n  baz\nTags: a, b\n")))
+        self.assertEqual(meta._raw, {"name": "test", "tags": "a, b"})
+        self.assertEqual(meta.tags, {"a", "b"})
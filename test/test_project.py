@@ -1,9 +1,55 @@
 from __future__ import annotations
 
+import datetime
 import unittest
+from unittest import mock
+
+from egtlib import Project
+from egtlib.config import Config
+from egtlib.project import HAS_ORJSON, ProjectState
 
 from .utils import ProjectTestMixin
 
 
 class TestProject(ProjectTestMixin, unittest.TestCase):
-    pass
+    def test_gitdirs(self) -> None:
+        for path in (".git", "sub/.git", "sub/deep/.git", ".hidden/.git", "other"):
+            (self.workdir / path).mkdir(parents=True)
+        (self.workdir / "other" / ".git").touch()
+        (self.workdir / "file").touch()
+
+        proj = Project(self.workdir / ".egt", statedir=self.workdir, config=Config())
+        self.assertEqual(sorted(proj.gitdirs()), [self.workdir / ".git", self.workdir / "sub" / ".git"])
+        self.assertEqual(list(proj.gitdirs(depth=1)), [self.workdir / ".git"])
+        self.assertEqual(
+            sorted(proj.gitdirs(depth=3)),
+            [self.workdir / ".git", self.workdir / "sub" / ".git", self.workdir / "sub" / "deep" / ".git"],
+        )
+
+    def test_state(self) -> None:
+        proj = Project(self.workdir / ".egt", statedir=self.workdir, config=Config())
+        saved = []
+        for has_orjson in (True, False):
+            with self.subTest(has_orjson=has_orjson):
+                if has_orjson and not HAS_ORJSON:
+                    self.skipTest("orjson is not installed")
+                with mock.patch("egtlib.project.HAS_ORJSON", has_orjson):
+                    proj.state.set("tasks", {"ids": {1: "abc"}})
+                    proj.state.set("annotations", [["2023-01-01", "test ☺"]])
+                    saved.append(proj.state.abspath.read_bytes())
+                    state = ProjectState(proj)
+                    self.assertEqual(state.get("tasks"), {"ids": {"1": "abc"}})
+                    self.assertEqual(state.get("annotations"), [["2023-01-01", "test ☺"]])
+                    self.assertIsNone(state.get("missing"))
+        # The file format does not depend on the JSON backend
+        if len(saved) == 2:
+            self.assertEqual(saved[0], saved[1])
+
+    def test_formal_period(self) -> None:
+        today = datetime.date(2023, 6, 1)
+        proj = self.project(log=["2023", "15 march: 9:00-"])
+        self.assertEqual(proj.get_formal_period(today), (datetime.date(2023, 3, 15), today))
+
+        meta = {"Start-date": "2023-01-01", "End-date": "2023-02-01"}
+        proj = self.project(meta=meta, log=["2023", "15 march: 9:00-"])
+        self.assertEqual(proj.get_formal_period(today), (datetime.date(2023, 1, 1), datetime.date(2023, 2, 1)))